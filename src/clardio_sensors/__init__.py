@@ -10,14 +10,23 @@ Uses bleak for reliable BLE communication via BlueZ D-Bus API.
 """
 
 import asyncio
+import logging
+import logging.handlers
+import os
+import queue
+import signal
 import struct
+import sys
 import time
-import subprocess
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass, field
 
-import aiohttp
+import httpx
+import orjson
 from bleak import BleakClient, BleakScanner
 from bleak.backends.device import BLEDevice
+from bleak.backends.scanner import AdvertisementData
+from bleak.exc import BleakError
 
 
 # ============================================================================
@@ -35,16 +44,31 @@ CHAR_HEART_RATE = "00002a37-0000-1000-8000-00805f9b34fb"
 CHAR_CYCLING_POWER = "00002a63-0000-1000-8000-00805f9b34fb"
 CHAR_CSC_MEASUREMENT = "00002a5b-0000-1000-8000-00805f9b34fb"
 
-SERVER_URL = "http://localhost:3000/api/metrics"
-POST_INTERVAL = 4.0  # seconds
+# Overridable from the environment (see CLAUDE.md)
+SERVER_URL = os.environ.get("CLARDIO_SERVER_URL", "http://localhost:3000/api/metrics")
+POST_INTERVAL = float(os.environ.get("CLARDIO_POST_INTERVAL", "4.0"))  # seconds
+if not POST_INTERVAL > 0:  # also rejects NaN
+    raise ValueError(f"CLARDIO_POST_INTERVAL must be positive, got {POST_INTERVAL}")
 RECONNECT_DELAY = 5.0  # seconds
+RESTART_DELAY_MIN = 1.0  # seconds - backoff bounds for restarting a crashed task
+RESTART_DELAY_MAX = 5.0
+DIRECT_CONNECT_TIMEOUT = 5.0  # seconds - reconnect to a known device before scanning
+HEARTBEAT_INTERVAL = 10.0  # seconds - resend unchanged metrics (coach ticks every 20s)
+JSON_HEADERS = {"content-type": "application/json"}
+LOG_QUIET_NS = 5_000_000_000  # log small reading changes at most every 5s
+
+# Precompiled little-endian field layouts for the BLE parsers.
+# On CPython 3.12 these beat int.from_bytes() on a slice (which pays for the
+# slice copy); the lone unsigned HR field is cheaper still as two byte reads.
+_PWR_S16 = struct.Struct("<h")
+_CSC_U16U16 = struct.Struct("<HH")  # crank revs, crank event time
 
 
 # ============================================================================
 # State
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class SensorState:
     power: int = 0
     hr: int = 0
@@ -55,10 +79,50 @@ class SensorState:
     last_crank_revs: int | None = None
     last_crank_time: int | None = None
 
+    def snapshot(self) -> tuple[int, int, int, bool, bool]:
+        """Read (power, hr, cadence, connected_gymnasticon, connected_coros) at once."""
+        return (
+            self.power,
+            self.hr,
+            self.cadence,
+            self.connected_gymnasticon,
+            self.connected_coros,
+        )
+
+    def update_crank(self, crank_revs: int, crank_time: int) -> int | None:
+        """Record a crank reading and return cadence (RPM) if it can be computed."""
+        last_revs = self.last_crank_revs
+        last_time = self.last_crank_time
+        self.last_crank_revs = crank_revs
+        self.last_crank_time = crank_time
+
+        if last_revs is None or last_time is None:
+            return None
+
+        # Masking to 16 bits handles counter rollover without branching
+        rev_delta = (crank_revs - last_revs) & 0xFFFF
+        time_delta = (crank_time - last_time) & 0xFFFF
+
+        if time_delta == 0:
+            return None
+
+        # Convert to RPM: revs per (time in 1/1024 sec) * 1024 * 60, rounded
+        # with integer math (61440 = 1024 * 60)
+        return (rev_delta * 61440 + (time_delta >> 1)) // time_delta
+
 
 state = SensorState()
 
 
+def set_connected(attr: str, connected: bool, any_connected: asyncio.Event) -> None:
+    """Update a device's connection flag and the shared any_connected event."""
+    setattr(state, attr, connected)
+    if state.connected_gymnasticon or state.connected_coros:
+        any_connected.set()
+    else:
+        any_connected.clear()
+
+
 # ============================================================================
 # BLE Data Parsing
 # ============================================================================
@@ -68,7 +132,7 @@ def parse_heart_rate(data: bytes) -> int:
     flags = data[0]
     is_16bit = (flags & 0x01) != 0
     if is_16bit:
-        return struct.unpack_from("<H", data, 1)[0]
+        return data[1] | (data[2] << 8)
     else:
         return data[1]
 
@@ -76,14 +140,12 @@ def parse_heart_rate(data: bytes) -> int:
 def parse_cycling_power(data: bytes) -> int:
     """Parse Cycling Power Measurement characteristic (0x2A63)"""
     # Flags in bytes 0-1, instantaneous power in bytes 2-3
-    power = struct.unpack_from("<h", data, 2)[0]
+    power = _PWR_S16.unpack_from(data, 2)[0]
     return max(0, power)
 
 
 def parse_csc_measurement(data: bytes) -> int | None:
     """Parse CSC Measurement characteristic (0x2A5B) for cadence"""
-    global state
-
     flags = data[0]
     has_crank_data = (flags & 0x02) != 0
 
@@ -94,61 +156,85 @@ def parse_csc_measurement(data: bytes) -> int | None:
     has_wheel_data = (flags & 0x01) != 0
     offset = 7 if has_wheel_data else 1
 
-    crank_revs = struct.unpack_from("<H", data, offset)[0]
-    crank_time = struct.unpack_from("<H", data, offset + 2)[0]  # 1/1024 sec resolution
+    # Crank event time has 1/1024 sec resolution
+    crank_revs, crank_time = _CSC_U16U16.unpack_from(data, offset)
 
-    # Calculate cadence from delta
-    if state.last_crank_revs is not None and state.last_crank_time is not None:
-        rev_delta = crank_revs - state.last_crank_revs
-        time_delta = crank_time - state.last_crank_time
-
-        # Handle 16-bit rollover
-        if rev_delta < 0:
-            rev_delta += 65536
-        if time_delta < 0:
-            time_delta += 65536
-
-        if time_delta > 0:
-            # Convert to RPM: revs per (time in 1/1024 sec) * 1024 * 60
-            cadence = (rev_delta / time_delta) * 1024 * 60
-            state.last_crank_revs = crank_revs
-            state.last_crank_time = crank_time
-            return round(cadence)
-
-    state.last_crank_revs = crank_revs
-    state.last_crank_time = crank_time
-    return None
+    return state.update_crank(crank_revs, crank_time)
 
 
 # ============================================================================
 # Notification Handlers
 # ============================================================================
 
+logger = logging.getLogger("clardio_sensors")
+
+
+def setup_logging() -> logging.handlers.QueueListener:
+    """Route log records through a queue so stdout writes happen off the event loop."""
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(logging.Formatter("[%(asctime)s] %(message)s", datefmt="%H:%M:%S"))
+
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+    listener = logging.handlers.QueueListener(log_queue, stream)
+    listener.start()
+    return listener
+
+
 def log(msg: str) -> None:
     """Log with timestamp."""
-    ts = time.strftime("%H:%M:%S")
-    print(f"[{ts}] {msg}")
+    logger.info(msg)
+
+
+@dataclass(slots=True)
+class ChangeLog:
+    """Log a changed reading only if it moved by `threshold` or the last log is stale."""
+    fmt: str
+    threshold: int
+    last: int | None = None
+    last_ns: int = 0
+
+    def update(self, value: int) -> None:
+        if value == self.last:
+            return
+        now_ns = time.monotonic_ns()
+        if (
+            self.last is not None
+            and abs(value - self.last) < self.threshold
+            and now_ns - self.last_ns < LOG_QUIET_NS
+        ):
+            return
+        log(self.fmt.format(value))
+        self.last = value
+        self.last_ns = now_ns
+
+
+# Small jitter (1 bpm, 1 W) is frequent; the status loop still reports exact values
+hr_log = ChangeLog("[HR] {} bpm", threshold=2)
+power_log = ChangeLog("[PWR] {}W", threshold=3)
+cadence_log = ChangeLog("[CAD] {} rpm", threshold=2)
 
 
 def handle_heart_rate(_sender: int, data: bytes) -> None:
     hr = parse_heart_rate(data)
-    if hr != state.hr:
-        log(f"[HR] {hr} bpm")
+    hr_log.update(hr)
     state.hr = hr
 
 
 def handle_cycling_power(_sender: int, data: bytes) -> None:
     power = parse_cycling_power(data)
-    if power != state.power:
-        log(f"[PWR] {power}W")
+    power_log.update(power)
     state.power = power
 
 
 def handle_csc_measurement(_sender: int, data: bytes) -> None:
     cadence = parse_csc_measurement(data)
-    if cadence is not None and cadence != state.cadence:
-        log(f"[CAD] {cadence} rpm")
     if cadence is not None:
+        cadence_log.update(cadence)
         state.cadence = cadence
 
 
@@ -160,12 +246,27 @@ async def connect_device(
     device: BLEDevice,
     name: str,
     characteristics: list[tuple[str, callable]],
-) -> BleakClient | None:
-    """Connect to a device and subscribe to characteristics."""
+    timeout: float | None = None,
+) -> tuple[BleakClient, asyncio.Event] | None:
+    """Connect to a device and subscribe to characteristics.
+
+    `timeout` overrides bleak's default connect timeout (which also covers
+    GATT service discovery). Returns the client and an event that is set when
+    this client disconnects.
+    """
     log(f"[BLE] Connecting to {name} ({device.address})...")
 
+    # Each attempt gets its own event, so a late callback from an abandoned
+    # client can't mark a newer connection as disconnected
+    loop = asyncio.get_running_loop()
+    disconnected = asyncio.Event()
+
+    def on_disconnect(_client: BleakClient) -> None:
+        loop.call_soon_threadsafe(disconnected.set)
+
+    client_kwargs = {} if timeout is None else {"timeout": timeout}
+    client = BleakClient(device, disconnected_callback=on_disconnect, **client_kwargs)
     try:
-        client = BleakClient(device)
         await client.connect()
         log(f"[BLE] Connected to {name}")
 
@@ -176,9 +277,14 @@ async def connect_device(
             except Exception as e:
                 log(f"[BLE] Failed to subscribe to {char_uuid}: {e}")
 
-        return client
+        return client, disconnected
     except Exception as e:
         log(f"[BLE] Failed to connect to {name}: {e}")
+        # Tear down a half-open link rather than leaving it to BlueZ
+        try:
+            await client.disconnect()
+        except Exception:
+            pass
         return None
 
 
@@ -187,29 +293,46 @@ async def manage_device(
     name: str,
     characteristics: list[tuple[str, callable]],
     set_connected: callable,
-    device_queue: asyncio.Queue,
+    device_futures: dict[str, asyncio.Future[BLEDevice]],
+    scan_wanted: set[str],
+    scan_requested: asyncio.Event,
 ) -> None:
-    """Manage connection to a single device, receiving devices from shared scanner."""
-    while True:
-        # Wait for our device to be found by the scanner
-        device = await device_queue.get()
+    """Manage connection to a single device, falling back to the shared scanner."""
+    loop = asyncio.get_running_loop()
+    # Device from the last successful connect. Reconnecting with it reuses the
+    # BlueZ object path, so bleak connects without running discovery.
+    last_device: BLEDevice | None = None
 
-        log(f"[BLE] Found {name}")
-        client = await connect_device(device, name, characteristics)
-
-        if client is None:
+    while True:
+        connection = None
+        if last_device is not None:
+            connection = await connect_device(
+                last_device, name, characteristics, timeout=DIRECT_CONNECT_TIMEOUT
+            )
+
+        if connection is None:
+            # Ask the scanner for our device and wait for it to be found
+            last_device = None
+            scan_wanted.add(mac)
+            scan_requested.set()
+            device = await device_futures[mac]
+            device_futures[mac] = loop.create_future()
+
+            log(f"[BLE] Found {name}")
+            connection = await connect_device(device, name, characteristics)
+            if connection is not None:
+                last_device = device
+
+        if connection is None:
             log(f"[BLE] Waiting {RECONNECT_DELAY}s before retry...")
             await asyncio.sleep(RECONNECT_DELAY)
             continue
 
+        _client, disconnected = connection
         set_connected(True)
 
-        # Wait for disconnect
-        try:
-            while client.is_connected:
-                await asyncio.sleep(1.0)
-        except Exception as e:
-            log(f"[BLE] {name} connection error: {e}")
+        # Bleak fires the disconnected callback as soon as the link drops
+        await disconnected.wait()
 
         log(f"[BLE] {name} disconnected")
         set_connected(False)
@@ -223,39 +346,51 @@ async def manage_device(
 
 
 async def scan_for_devices(
-    targets: dict[str, asyncio.Queue],
+    targets: dict[str, asyncio.Future[BLEDevice]],
+    wanted: set[str],
+    requested: asyncio.Event,
 ) -> None:
-    """Single scanner that finds devices and dispatches to their queues."""
-    found: set[str] = set()
+    """Single scanner that hands wanted devices to their managers as soon as they advertise."""
+    all_found = asyncio.Event()
+
+    def on_advertisement(device: BLEDevice, _adv: AdvertisementData) -> None:
+        if device.address not in wanted:
+            return
+        log(f"[BLE] Scanner found target: {device.address} ({device.name})")
+        wanted.discard(device.address)
+        future = targets[device.address]
+        if not future.done():
+            future.set_result(device)
+        if not wanted:
+            all_found.set()
 
     while True:
-        # Figure out what we're still looking for
-        needed = {mac for mac in targets.keys() if mac not in found}
+        # Only scan for devices that have no known device to reconnect to
+        needed = set(wanted)
 
         if not needed:
-            # All devices connected, wait a bit then check again
-            await asyncio.sleep(RECONNECT_DELAY)
-            found.clear()  # Reset so we can find them again if they disconnect
+            # Sleep until a manager asks for a scan
+            requested.clear()
+            await requested.wait()
             continue
 
         log(f"[BLE] Scanning for {len(needed)} device(s): {', '.join(needed)}")
+        all_found.clear()
 
         try:
-            devices = await BleakScanner.discover(timeout=10.0)
-            log(f"[BLE] Scan found {len(devices)} device(s)")
-
-            for device in devices:
-                if device.address in needed:
-                    log(f"[BLE] Scanner found target: {device.address} ({device.name})")
-                    found.add(device.address)
-                    await targets[device.address].put(device)
+            # Stop scanning as soon as everything is found to free up the radio
+            async with BleakScanner(detection_callback=on_advertisement):
+                try:
+                    await asyncio.wait_for(all_found.wait(), timeout=10.0)
+                except TimeoutError:
+                    pass
 
             # Log if we didn't find what we needed
-            still_needed = needed - found
-            if still_needed:
-                log(f"[BLE] Still looking for: {', '.join(still_needed)}")
+            if wanted:
+                log(f"[BLE] Still looking for: {', '.join(wanted)}")
 
-        except Exception as e:
+        except (BleakError, OSError) as e:
+            # Adapter resets and BlueZ restarts are routine; retry shortly
             log(f"[BLE] Scan error: {e}")
 
         await asyncio.sleep(1.0)  # Brief pause between scans
@@ -265,24 +400,58 @@ async def scan_for_devices(
 # Metrics Posting
 # ============================================================================
 
-async def post_metrics_loop() -> None:
+def _build_payload(
+    metrics: dict[str, int], snapshot: tuple[int, int, int, bool, bool]
+) -> bytes | None:
+    """Fill metrics from connected devices and return the JSON body, or None if empty.
+
+    All sensors share one POST on purpose: splitting into per-device POSTs
+    would multiply round-trips to the server for no benefit.
+    """
+    power, hr, cadence, connected_gymnasticon, connected_coros = snapshot
+    metrics.clear()
+    if connected_gymnasticon:
+        metrics["power"] = power
+        metrics["cadence"] = cadence
+    if connected_coros:
+        metrics["hr"] = hr
+    return orjson.dumps(metrics) if metrics else None
+
+
+async def post_metrics_loop(any_connected: asyncio.Event) -> None:
     """POST metrics to the server - only include connected device metrics."""
-    async with aiohttp.ClientSession() as session:
+    # One warm keep-alive connection to the local server is all we need
+    limits = httpx.Limits(max_keepalive_connections=1, max_connections=1)
+    async with httpx.AsyncClient(timeout=2.0, limits=limits) as client:
+        last_sent: tuple | None = None
+        last_sent_ns = 0
+        heartbeat_ns = int(HEARTBEAT_INTERVAL * 1_000_000_000)
+        metrics: dict[str, int] = {}  # Reused across iterations
+
         while True:
+            # Nothing to report until a device connects
+            await any_connected.wait()
+
+            # Skip the POST when nothing changed, but still send a heartbeat so
+            # the server keeps recording samples and can tell the bridge is alive
+            key = state.snapshot()
+            now_ns = time.monotonic_ns()
+            if key == last_sent and now_ns - last_sent_ns < heartbeat_ns:
+                await asyncio.sleep(POST_INTERVAL)
+                continue
+
             # Only include metrics from connected devices
-            metrics: dict[str, int] = {}
-            if state.connected_gymnasticon:
-                metrics["power"] = state.power
-                metrics["cadence"] = state.cadence
-            if state.connected_coros:
-                metrics["hr"] = state.hr
-
-            if metrics:
+            body = _build_payload(metrics, key)
+
+            if body is not None:
                 try:
-                    async with session.post(SERVER_URL, json=metrics) as resp:
-                        if resp.status != 200:
-                            log(f"[HTTP] POST failed: {resp.status}")
-                except aiohttp.ClientError as e:
+                    resp = await client.post(SERVER_URL, content=body, headers=JSON_HEADERS)
+                    if resp.status_code != 200:
+                        log(f"[HTTP] POST failed: {resp.status_code}")
+                    else:
+                        last_sent = key
+                        last_sent_ns = now_ns
+                except httpx.HTTPError as e:
                     log(f"[HTTP] POST error: {e}")
 
             await asyncio.sleep(POST_INTERVAL)
@@ -292,11 +461,12 @@ async def log_status_loop() -> None:
     """Log status every 5 seconds."""
     while True:
         await asyncio.sleep(5.0)
-        gym = "✓" if state.connected_gymnasticon else "✗"
-        coros = "✓" if state.connected_coros else "✗"
+        power, hr, cadence, connected_gymnasticon, connected_coros = state.snapshot()
+        gym = "✓" if connected_gymnasticon else "✗"
+        coros = "✓" if connected_coros else "✗"
 
         log(
-            f"[STATUS] P:{state.power}W HR:{state.hr} C:{state.cadence}rpm | "
+            f"[STATUS] P:{power}W HR:{hr} C:{cadence}rpm | "
             f"Gym:{gym} COROS:{coros}"
         )
 
@@ -305,23 +475,59 @@ async def log_status_loop() -> None:
 # Bluetooth Service Check
 # ============================================================================
 
-def ensure_bluetooth_service() -> bool:
-    """Ensure the Bluetooth service is running."""
+async def bluetooth_service_active() -> bool:
+    """Ask systemd over D-Bus whether bluetooth.service is active (no systemctl fork)."""
+    # dbus-fast is only installed on Linux; an ImportError elsewhere is
+    # handled by ensure_bluetooth_service() like any other failed check
+    from dbus_fast import BusType, Message, MessageType
+    from dbus_fast.aio import MessageBus
+
+    bus = await MessageBus(bus_type=BusType.SYSTEM).connect()
     try:
-        result = subprocess.run(
-            ["systemctl", "is-active", "bluetooth"],
-            capture_output=True,
-            text=True,
+        reply = await bus.call(
+            Message(
+                destination="org.freedesktop.systemd1",
+                path="/org/freedesktop/systemd1",
+                interface="org.freedesktop.systemd1.Manager",
+                member="LoadUnit",
+                signature="s",
+                body=["bluetooth.service"],
+            )
         )
-        if result.stdout.strip() == "active":
+        if reply.message_type == MessageType.ERROR:
+            return False
+
+        reply = await bus.call(
+            Message(
+                destination="org.freedesktop.systemd1",
+                path=reply.body[0],
+                interface="org.freedesktop.DBus.Properties",
+                member="Get",
+                signature="ss",
+                body=["org.freedesktop.systemd1.Unit", "ActiveState"],
+            )
+        )
+        if reply.message_type == MessageType.ERROR:
+            return False
+        return reply.body[0].value == "active"
+    finally:
+        bus.disconnect()
+
+
+async def ensure_bluetooth_service() -> bool:
+    """Ensure the Bluetooth service is running."""
+    try:
+        if await bluetooth_service_active():
             return True
     except Exception:
         pass
 
     log("[BLE] Bluetooth service not running, attempting to start...")
     try:
-        subprocess.run(["systemctl", "start", "bluetooth"], check=True)
-        time.sleep(1)
+        proc = await asyncio.create_subprocess_exec("systemctl", "start", "bluetooth")
+        if await proc.wait() != 0:
+            raise RuntimeError(f"systemctl exited with status {proc.returncode}")
+        await asyncio.sleep(1)
         log("[BLE] Bluetooth service started")
         return True
     except Exception as e:
@@ -329,11 +535,41 @@ def ensure_bluetooth_service() -> bool:
         return False
 
 
+# ============================================================================
+# Task Supervision
+# ============================================================================
+
+async def supervise(name: str, run: Callable[[], Awaitable[None]]) -> None:
+    """Run a long-lived task, restarting it with a short backoff if it crashes.
+
+    Routine BLE and HTTP errors are retried inside each loop; this only catches
+    what escapes them, so one unexpected failure doesn't stop the bridge.
+    """
+    delay = RESTART_DELAY_MIN
+    while True:
+        started = time.monotonic()
+        try:
+            await run()
+            return
+        except Exception as e:
+            # A task that ran for a while before failing starts backoff over
+            if time.monotonic() - started > RESTART_DELAY_MAX:
+                delay = RESTART_DELAY_MIN
+            log(f"[TASK] {name} failed: {e!r}, restarting in {delay:.0f}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RESTART_DELAY_MAX)
+
+
 # ============================================================================
 # Main
 # ============================================================================
 
 async def async_main() -> None:
+    # The server stops the bridge with SIGTERM; cancel so main() can flush logs
+    loop = asyncio.get_running_loop()
+    loop.add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+
+    # Printed directly, so it must come before the first queued log() line
     print("=" * 60)
     print("Clardio Bluetooth Sensor Bridge (bleak)")
     print("=" * 60)
@@ -343,47 +579,69 @@ async def async_main() -> None:
     print(f"POSTing to: {SERVER_URL}")
     print("=" * 60)
 
-    # Create queues for each device
-    gymnasticon_queue: asyncio.Queue[BLEDevice] = asyncio.Queue()
-    coros_queue: asyncio.Queue[BLEDevice] = asyncio.Queue()
+    if not await ensure_bluetooth_service():
+        log("[BLE] Cannot proceed without Bluetooth service")
+        return
 
-    # Map MACs to their queues for the scanner
-    device_queues = {
-        DEVICES["gymnasticon"]: gymnasticon_queue,
-        DEVICES["coros_pace_3"]: coros_queue,
+    # One pending future per MAC; the scanner resolves it and the manager
+    # replaces it with a fresh one after taking the device
+    device_futures: dict[str, asyncio.Future[BLEDevice]] = {
+        mac: loop.create_future() for mac in DEVICES.values()
     }
-
-    # Start all tasks
-    await asyncio.gather(
-        scan_for_devices(device_queues),
-        manage_device(
-            DEVICES["gymnasticon"],
-            "Gymnasticon",
-            [
-                (CHAR_CYCLING_POWER, handle_cycling_power),
-                (CHAR_CSC_MEASUREMENT, handle_csc_measurement),
-            ],
-            lambda v: setattr(state, "connected_gymnasticon", v),
-            gymnasticon_queue,
-        ),
-        manage_device(
-            DEVICES["coros_pace_3"],
-            "COROS PACE 3",
-            [(CHAR_HEART_RATE, handle_heart_rate)],
-            lambda v: setattr(state, "connected_coros", v),
-            coros_queue,
-        ),
-        post_metrics_loop(),
-        log_status_loop(),
-    )
+    # MACs whose manager is waiting on the scanner
+    scan_wanted: set[str] = set()
+    scan_requested = asyncio.Event()
+    # Set while at least one device is connected
+    any_connected = asyncio.Event()
+
+    # Start all tasks; the group cancels the rest on shutdown or a fatal error
+    async with asyncio.TaskGroup() as tg:
+        tg.create_task(
+            supervise(
+                "scanner",
+                lambda: scan_for_devices(device_futures, scan_wanted, scan_requested),
+            )
+        )
+        tg.create_task(
+            supervise(
+                "Gymnasticon",
+                lambda: manage_device(
+                    DEVICES["gymnasticon"],
+                    "Gymnasticon",
+                    [
+                        (CHAR_CYCLING_POWER, handle_cycling_power),
+                        (CHAR_CSC_MEASUREMENT, handle_csc_measurement),
+                    ],
+                    lambda v: set_connected("connected_gymnasticon", v, any_connected),
+                    device_futures,
+                    scan_wanted,
+                    scan_requested,
+                ),
+            )
+        )
+        tg.create_task(
+            supervise(
+                "COROS PACE 3",
+                lambda: manage_device(
+                    DEVICES["coros_pace_3"],
+                    "COROS PACE 3",
+                    [(CHAR_HEART_RATE, handle_heart_rate)],
+                    lambda v: set_connected("connected_coros", v, any_connected),
+                    device_futures,
+                    scan_wanted,
+                    scan_requested,
+                ),
+            )
+        )
+        tg.create_task(supervise("metrics", lambda: post_metrics_loop(any_connected)))
+        tg.create_task(log_status_loop())
 
 
 def main() -> None:
-    if not ensure_bluetooth_service():
-        log("[BLE] Cannot proceed without Bluetooth service")
-        return
-
+    listener = setup_logging()
     try:
         asyncio.run(async_main())
-    except KeyboardInterrupt:
+    except (KeyboardInterrupt, asyncio.CancelledError):
         log("[BLE] Shutting down...")
+    finally:
+        listener.stop()  # Flushes any queued records